@@ -4,19 +4,61 @@ Pushbullet to Linkwarden Bridge
 Listens to Pushbullet pushes and automatically saves links to Linkwarden collections.
 """
 
+import codecs
+import copy
+import errno
 import json
 import logging
+import os
+import random
+import re
 import signal
 import sys
+import threading
 import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin
 
+import lxml.html
 import requests
 import websocket
-from bs4 import BeautifulSoup
+import yaml
+from requests.adapters import HTTPAdapter
 from ruamel.yaml import YAML
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib
+    orjson = None
+
+try:
+    from yaml import CSafeLoader as _BaseYamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _BaseYamlLoader
+
+
+class _YamlLoader(_BaseYamlLoader):
+    """
+    PyYAML loader with YAML 1.2 booleans, matching ruamel (used by
+    save_config): only true/false are booleans, so unquoted names such as
+    No, On or yes stay strings.
+    """
+
+
+_YamlLoader.yaml_implicit_resolvers = {
+    first_char: [(tag, regexp) for tag, regexp in resolvers if tag != 'tag:yaml.org,2002:bool']
+    for first_char, resolvers in _BaseYamlLoader.yaml_implicit_resolvers.items()
+}
+_YamlLoader.add_implicit_resolver(
+    'tag:yaml.org,2002:bool',
+    re.compile(r'^(?:true|True|TRUE|false|False|FALSE)$'),
+    list('tTfF')
+)
 
 # Constants
 PUSHBULLET_WS_URL = "wss://stream.pushbullet.com/websocket/{token}"
@@ -24,6 +66,123 @@ PUSHBULLET_API_BASE = "https://api.pushbullet.com/v2"
 PROCESSED_PUSHES_FILE = "processed_pushes.json"
 CONFIG_FILE = "config.yaml"
 FIREFOX_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:133.0) Gecko/20100101 Firefox/133.0"
+MAX_PUSH_WORKERS = 8
+MAX_BACKOFF_EXPONENT = 16
+CONFIG_CACHE_MAX_ENTRIES = 100
+MAX_REDIRECT_HOPS = 5
+# Short-link hosts whose redirects are resolved before saving
+REDIRECT_URL_PREFIXES = (
+    'https://search.app/',
+    'https://t.co/',
+    'https://bit.ly/',
+    'https://tinyurl.com/',
+)
+TITLE_SCAN_LIMIT = 64 * 1024  # Max bytes of a page to read when looking for <title>
+URL_CACHE_MAX_ENTRIES = 1024
+
+HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value for key (marking it recently used), or None"""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Any, value: Any) -> None:
+        """Store value for key, evicting the least recently used entries"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def json_loads(data: Any) -> Any:
+    """Decode JSON from str or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def detect_html_charset(content_type: str, content: bytes) -> Optional[str]:
+    """
+    Pick the encoding of an HTML prefix: the Content-Type header charset,
+    then a <meta> charset, then UTF-8 if the bytes decode as UTF-8.
+    Returns None when nothing fits, leaving detection to the parser.
+    """
+    for match in (HEADER_CHARSET_RE.search(content_type), META_CHARSET_RE.search(content)):
+        if not match:
+            continue
+        charset = match.group(1)
+        if isinstance(charset, bytes):
+            charset = charset.decode('ascii')
+        try:
+            # Validate only: Python's canonical codec names (e.g. 'euc_jp')
+            # aren't all known to libxml2, the declared ones are
+            codecs.lookup(charset)
+        except LookupError:
+            continue
+        return charset
+
+    try:
+        # Not final: the prefix may end in the middle of a multi-byte character
+        codecs.getincrementaldecoder('utf-8')().decode(content, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return None
+
+
+class CappedRetry(Retry):
+    """Retry policy that never sleeps longer than retry_after_cap on Retry-After"""
+
+    retry_after_cap: float = 30
+
+    def new(self, **kw: Any) -> "CappedRetry":
+        retry = super().new(**kw)
+        retry.retry_after_cap = self.retry_after_cap
+        return retry
+
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.retry_after_cap)
+
+
+# Parsed config cache: path -> (mtime_ns, size, config)
+_config_cache = LRUCache(CONFIG_CACHE_MAX_ENTRIES)
+
+
+def _get_cached_config(path: str, st: os.stat_result) -> Optional[Any]:
+    """Return a copy of the cached config for path if the file is unchanged"""
+    entry = _config_cache.get(path)
+    if entry is None or entry[:2] != (st.st_mtime_ns, st.st_size):
+        return None
+    return copy.deepcopy(entry[2])
+
+
+def _cache_config(path: str, st: os.stat_result, config: Any) -> None:
+    """Remember a parsed config keyed on the file's mtime and size"""
+    _config_cache.put(path, (st.st_mtime_ns, st.st_size, copy.deepcopy(config)))
 
 
 @dataclass
@@ -34,6 +193,7 @@ class AppSettings:
     reconnect_max_delay: int = 300
     reconnect_initial_delay: int = 2
     request_timeout: int = 30
+    always_refetch_title: bool = False
 
 
 class PushbulletLinkwardenBridge:
@@ -44,10 +204,54 @@ class PushbulletLinkwardenBridge:
         self.config: Dict[str, Any] = {}
         self.settings = AppSettings()
         self.running = True
+        self._config_dirty = False  # resolved IDs not yet written to config file
+        self._stop_event = threading.Event()  # set on shutdown to cut reconnect waits short
         self.ws: Optional[websocket.WebSocketApp] = None
         self.processed_pushes: Dict[str, float] = {}  # device_iden -> last_modified
+        self._pb_token = ''  # snapshotted from config in load_config()
+        self._lw_api_base = ''
+        # Lookup tables derived from config['channels'], see _rebuild_indexes()
+        self._iden_to_channel: Dict[str, Dict[str, Any]] = {}
+        self._device_to_collection: Dict[str, Optional[int]] = {}
+        self._collection_to_name: Dict[int, str] = {}
         self.logger = self._setup_logging()
         self.reconnect_delay = 2
+        self._reconnect_attempt = 0
+
+        # Pushes are processed on a worker pool so their network I/O overlaps
+        self._executor = ThreadPoolExecutor(max_workers=MAX_PUSH_WORKERS,
+                                            thread_name_prefix="push")
+        # Re-entrant so _signal_handler can flush even if it interrupts a flush
+        self._state_lock = threading.RLock()
+        self._pushes_dirty = False  # processed_pushes changed since last save
+        # Per device: modified times of dispatched pushes not yet finished, and
+        # of finished pushes the watermark can't move past yet (see _finish_push)
+        self._in_flight: Dict[str, List[float]] = defaultdict(list)
+        self._finished: Dict[str, List[float]] = defaultdict(list)
+
+        # Long-lived HTTP sessions so TCP+TLS connections are reused.
+        # POST is not in urllib3's default allowed_methods, so creating a
+        # link/device/collection is never retried and can't be duplicated.
+        self._api_retry = CappedRetry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        self._pb_session = self._build_session(self._api_retry)
+        self._lw_session = self._build_session(self._api_retry)
+        # Scraped sites are arbitrary third parties: retry a failed connection
+        # once, but never wait on their 429/503 Retry-After
+        self._scrape_session = self._build_session(Retry(
+            total=1,
+            backoff_factor=0.3,
+            respect_retry_after_header=False
+        ))
+        self._scrape_session.headers.update({'User-Agent': FIREFOX_USER_AGENT})
+
+        # Successful title lookups and redirect resolutions, keyed by URL
+        self._title_cache = LRUCache(URL_CACHE_MAX_ENTRIES)
+        self._resolved_url_cache = LRUCache(URL_CACHE_MAX_ENTRIES)
 
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -66,24 +270,48 @@ class PushbulletLinkwardenBridge:
         logger.setLevel(logging.INFO)
         return logger
 
+    @staticmethod
+    def _build_session(retry: Retry) -> requests.Session:
+        """Create a pooled HTTP session using the given retry policy"""
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _close_sessions(self) -> None:
+        """Close all HTTP sessions"""
+        for session in (self._pb_session, self._lw_session, self._scrape_session):
+            session.close()
+
     def _signal_handler(self, signum: int, frame: Any) -> None:
         """Handle shutdown signals gracefully"""
         self.logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.running = False
+        self._stop_event.set()
         if self.ws:
             self.ws.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        # History is saved once per batch, so persist what has completed so far
+        self._flush_processed_pushes()
+        self._close_sessions()
         sys.exit(0)
 
     def load_config(self) -> None:
         """Load configuration from YAML file"""
         self.logger.info(f"Loading configuration from {self.config_path}")
-        yaml = YAML()
-        yaml.preserve_quotes = True
-        yaml.default_flow_style = False
 
+        # Plain PyYAML is enough for reading; comments only matter in save_config
         try:
-            with open(self.config_path, 'r') as f:
-                self.config = yaml.load(f)
+            st = os.stat(self.config_path)
+            cached = _get_cached_config(self.config_path, st)
+            if cached is not None:
+                self.logger.debug("Configuration unchanged on disk, using cached copy")
+                self.config = cached
+            else:
+                with open(self.config_path, 'r') as f:
+                    self.config = yaml.load(f, Loader=_YamlLoader)
+                _cache_config(self.config_path, st, self.config)
         except FileNotFoundError:
             self.logger.error(f"Configuration file not found: {self.config_path}")
             self.logger.error("Please copy config.example.yaml to config.yaml and configure it")
@@ -100,23 +328,56 @@ class PushbulletLinkwardenBridge:
             self.settings.reconnect_max_delay = settings.get('reconnect_max_delay', 300)
             self.settings.reconnect_initial_delay = settings.get('reconnect_initial_delay', 2)
             self.settings.request_timeout = settings.get('request_timeout', 30)
+            self._api_retry.retry_after_cap = self.settings.request_timeout
+            self.settings.always_refetch_title = settings.get('always_refetch_title', False)
 
             # Update log level
             self.logger.setLevel(getattr(logging, self.settings.log_level.upper()))
 
+        # Snapshot the values used on every request so the hot path doesn't
+        # walk the config dict, and set auth headers once on the sessions
+        pushbullet = self.config.get('pushbullet') or {}
+        linkwarden = self.config.get('linkwarden') or {}
+        self._pb_token = pushbullet.get('api_token') or ''
+        self._lw_api_base = f"{(linkwarden.get('api_url') or '').rstrip('/')}/api/v1"
+
+        if self._pb_token:
+            self._pb_session.headers.update({
+                'Authorization': f"Bearer {self._pb_token}",
+                'Content-Type': 'application/json'
+            })
+        if linkwarden.get('api_token'):
+            self._lw_session.headers.update({
+                'Authorization': f"Bearer {linkwarden['api_token']}",
+                'Content-Type': 'application/json'
+            })
+
         if self.settings.dry_run:
             self.logger.info("DRY RUN MODE: Links will not be created in Linkwarden")
 
     def save_config(self) -> None:
-        """Save configuration to YAML file (preserving comments)"""
+        """Save resolved channel IDs to YAML file (preserving comments)"""
         self.logger.info(f"Updating configuration file: {self.config_path}")
-        yaml = YAML()
-        yaml.preserve_quotes = True
-        yaml.default_flow_style = False
+        ruamel_yaml = YAML()
+        ruamel_yaml.preserve_quotes = True
+        ruamel_yaml.default_flow_style = False
 
         try:
+            # Re-read with ruamel so comments and formatting survive the write,
+            # then merge in the IDs resolved at runtime
+            with open(self.config_path, 'r') as f:
+                document = ruamel_yaml.load(f)
+
+            for on_disk, channel in zip(document.get('channels') or [],
+                                        self.config.get('channels') or []):
+                for key in ('device_iden', 'collection_id'):
+                    if channel.get(key) is not None:
+                        on_disk[key] = channel[key]
+
             with open(self.config_path, 'w') as f:
-                yaml.dump(self.config, f)
+                ruamel_yaml.dump(document, f)
+            self._config_dirty = False
+            _cache_config(self.config_path, os.stat(self.config_path), self.config)
         except Exception as e:
             self.logger.error(f"Error saving configuration: {e}")
 
@@ -153,16 +414,11 @@ class PushbulletLinkwardenBridge:
     def _make_pushbullet_request(self, method: str, endpoint: str, **kwargs) -> Optional[requests.Response]:
         """Make authenticated request to Pushbullet API"""
         url = f"{PUSHBULLET_API_BASE}/{endpoint}"
-        headers = {
-            'Authorization': f"Bearer {self.config['pushbullet']['api_token']}",
-            'Content-Type': 'application/json'
-        }
 
         try:
-            response = requests.request(
+            response = self._pb_session.request(
                 method,
                 url,
-                headers=headers,
                 timeout=self.settings.request_timeout,
                 **kwargs
             )
@@ -174,17 +430,12 @@ class PushbulletLinkwardenBridge:
 
     def _make_linkwarden_request(self, method: str, endpoint: str, **kwargs) -> Optional[requests.Response]:
         """Make authenticated request to Linkwarden API"""
-        url = f"{self.config['linkwarden']['api_url']}/api/v1/{endpoint}"
-        headers = {
-            'Authorization': f"Bearer {self.config['linkwarden']['api_token']}",
-            'Content-Type': 'application/json'
-        }
+        url = f"{self._lw_api_base}/{endpoint}"
 
         try:
-            response = requests.request(
+            response = self._lw_session.request(
                 method,
                 url,
-                headers=headers,
                 timeout=self.settings.request_timeout,
                 **kwargs
             )
@@ -200,7 +451,7 @@ class PushbulletLinkwardenBridge:
         response = self._make_pushbullet_request('GET', 'devices')
 
         if response:
-            devices = response.json().get('devices', [])
+            devices = json_loads(response.content).get('devices', [])
             self.logger.info(f"Found {len(devices)} Pushbullet devices")
             return devices
         return []
@@ -211,11 +462,11 @@ class PushbulletLinkwardenBridge:
         response = self._make_pushbullet_request(
             'POST',
             'devices',
-            json={'nickname': nickname, 'icon': 'system'}
+            data=json_dumps({'nickname': nickname, 'icon': 'system'})
         )
 
         if response:
-            device_iden = response.json().get('iden')
+            device_iden = json_loads(response.content).get('iden')
             self.logger.info(f"Created device {nickname} with iden: {device_iden}")
             return device_iden
         return None
@@ -226,7 +477,6 @@ class PushbulletLinkwardenBridge:
         devices = self.fetch_pushbullet_devices()
         device_map = {d.get('nickname'): d.get('iden') for d in devices if d.get('nickname')}
 
-        config_updated = False
         for channel in self.config['channels']:
             device_name = channel.get('name')
             if not device_name:
@@ -237,16 +487,15 @@ class PushbulletLinkwardenBridge:
                 if device_name in device_map:
                     channel['device_iden'] = device_map[device_name]
                     self.logger.info(f"Matched device '{device_name}' to iden: {channel['device_iden']}")
-                    config_updated = True
+                    self._config_dirty = True
                 else:
                     # Create new device
                     device_iden = self.create_pushbullet_device(device_name)
                     if device_iden:
                         channel['device_iden'] = device_iden
-                        config_updated = True
+                        self._config_dirty = True
 
-        if config_updated:
-            self.save_config()
+        self._rebuild_indexes()
 
     def fetch_linkwarden_collections(self) -> List[Dict[str, Any]]:
         """Fetch all Linkwarden collections"""
@@ -254,7 +503,7 @@ class PushbulletLinkwardenBridge:
         response = self._make_linkwarden_request('GET', 'collections')
 
         if response:
-            collections = response.json().get('response', [])
+            collections = json_loads(response.content).get('response', [])
             self.logger.info(f"Found {len(collections)} Linkwarden collections")
             return collections
         return []
@@ -265,11 +514,11 @@ class PushbulletLinkwardenBridge:
         response = self._make_linkwarden_request(
             'POST',
             'collections',
-            json={'name': name, 'description': 'Auto-created by Pushbullet bridge'}
+            data=json_dumps({'name': name, 'description': 'Auto-created by Pushbullet bridge'})
         )
 
         if response:
-            collection_id = response.json().get('response', {}).get('id')
+            collection_id = json_loads(response.content).get('response', {}).get('id')
             self.logger.info(f"Created collection '{name}' with id: {collection_id}")
             return collection_id
         return None
@@ -280,7 +529,6 @@ class PushbulletLinkwardenBridge:
         collections = self.fetch_linkwarden_collections()
         collection_map = {c.get('name'): c.get('id') for c in collections if c.get('name')}
 
-        config_updated = False
         for channel in self.config['channels']:
             collection_name = channel.get('collection')
             if not collection_name:
@@ -291,24 +539,54 @@ class PushbulletLinkwardenBridge:
                 if collection_name in collection_map:
                     channel['collection_id'] = collection_map[collection_name]
                     self.logger.info(f"Matched collection '{collection_name}' to id: {channel['collection_id']}")
-                    config_updated = True
+                    self._config_dirty = True
                 else:
                     # Create new collection
                     collection_id = self.create_linkwarden_collection(collection_name)
                     if collection_id:
                         channel['collection_id'] = collection_id
-                        config_updated = True
+                        self._config_dirty = True
 
-        if config_updated:
-            self.save_config()
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild channel lookup tables; call whenever config['channels'] changes"""
+        iden_to_channel: Dict[str, Dict[str, Any]] = {}
+        device_to_collection: Dict[str, Optional[int]] = {}
+        collection_to_name: Dict[int, str] = {}
+
+        # First matching channel wins, as with the previous linear scans
+        for channel in self.config.get('channels') or []:
+            device_iden = channel.get('device_iden')
+            collection_id = channel.get('collection_id')
+            if device_iden:
+                iden_to_channel.setdefault(device_iden, channel)
+                if device_iden not in device_to_collection:
+                    device_to_collection[device_iden] = collection_id
+            if collection_id:
+                collection_to_name.setdefault(
+                    collection_id, channel.get('collection', str(collection_id))
+                )
+
+        self._iden_to_channel = iden_to_channel
+        self._device_to_collection = device_to_collection
+        self._collection_to_name = collection_to_name
 
     def load_processed_pushes(self) -> None:
-        """Load history of processed pushes"""
+        """Load history of processed pushes, dropping devices no longer configured"""
         try:
             if Path(PROCESSED_PUSHES_FILE).exists():
-                with open(PROCESSED_PUSHES_FILE, 'r') as f:
-                    self.processed_pushes = json.load(f)
+                with open(PROCESSED_PUSHES_FILE, 'rb') as f:
+                    self.processed_pushes = json_loads(f.read())
                 self.logger.info(f"Loaded {len(self.processed_pushes)} processed push records")
+
+                # Keep the history O(channels) across device churn
+                stale = [iden for iden in self.processed_pushes if iden not in self._iden_to_channel]
+                if stale:
+                    for iden in stale:
+                        del self.processed_pushes[iden]
+                    self._pushes_dirty = True
+                    self.logger.info(f"Pruned {len(stale)} records for devices no longer configured")
             else:
                 self.logger.info("No previous push history found")
         except Exception as e:
@@ -316,22 +594,43 @@ class PushbulletLinkwardenBridge:
             self.processed_pushes = {}
 
     def save_processed_pushes(self) -> None:
-        """Save history of processed pushes"""
+        """Save history of processed pushes (atomically via a temp file where possible)"""
+        tmp_path = PROCESSED_PUSHES_FILE + '.tmp'
         try:
-            with open(PROCESSED_PUSHES_FILE, 'w') as f:
-                json.dump(self.processed_pushes, f, indent=2)
+            data = json_dumps(self.processed_pushes)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.replace(tmp_path, PROCESSED_PUSHES_FILE)
+            except OSError as e:
+                if e.errno not in (errno.EBUSY, errno.EXDEV):
+                    raise
+                # The state file is a single-file bind mount (e.g. the
+                # docker-compose setup) and can't be renamed over, so
+                # rewrite it in place instead
+                with open(PROCESSED_PUSHES_FILE, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.remove(tmp_path)
+            self._pushes_dirty = False
         except Exception as e:
             self.logger.error(f"Error saving processed pushes: {e}")
 
+    def _flush_processed_pushes(self) -> None:
+        """Save processed pushes if anything changed since the last save"""
+        with self._state_lock:
+            if self._pushes_dirty:
+                self.save_processed_pushes()
+
     def get_collection_for_device(self, device_iden: Optional[str]) -> Optional[int]:
         """Get the collection ID for a given device iden"""
         if not device_iden:
             return None
 
-        for channel in self.config['channels']:
-            if channel.get('device_iden') == device_iden:
-                return channel.get('collection_id')
-        return None
+        return self._device_to_collection.get(device_iden)
 
     def fetch_recent_pushes(self, modified_after: float = 0) -> List[Dict[str, Any]]:
         """Fetch recent pushes from Pushbullet"""
@@ -343,13 +642,19 @@ class PushbulletLinkwardenBridge:
         )
 
         if response:
-            pushes = response.json().get('pushes', [])
+            pushes = json_loads(response.content).get('pushes', [])
             self.logger.debug(f"Fetched {len(pushes)} recent pushes")
             return pushes
         return []
 
-    def process_push(self, push: Dict[str, Any]) -> None:
-        """Process a single push and save to Linkwarden if it's a link"""
+    def process_push(self, push: Dict[str, Any],
+                     watermarks: Optional[Dict[str, float]] = None) -> bool:
+        """
+        Process a single push and save to Linkwarden if it's a link.
+        "Already processed" is judged against watermarks (defaults to the live
+        processed_pushes). Returns True if the push was saved; moving the
+        watermark is left to the caller.
+        """
         push_type = push.get('type')
         push_iden = push.get('iden')
         push_modified = push.get('modified', 0)
@@ -357,7 +662,7 @@ class PushbulletLinkwardenBridge:
         # Only process link pushes
         if push_type != 'link':
             self.logger.debug(f"Skipping non-link push {push_iden} (type: {push_type})")
-            return
+            return False
 
         # Get device information
         target_device_iden = push.get('target_device_iden')
@@ -368,20 +673,22 @@ class PushbulletLinkwardenBridge:
 
         if not device_iden:
             self.logger.warning(f"Push {push_iden} has no device identifier, skipping")
-            return
+            return False
 
         # Check if we should process this device
         collection_id = self.get_collection_for_device(device_iden)
         if not collection_id:
             self.logger.debug(f"No collection configured for device {device_iden}, skipping")
-            return
+            return False
 
         # Check if already processed
-        if device_iden in self.processed_pushes:
-            last_processed = self.processed_pushes[device_iden]
+        if watermarks is None:
+            watermarks = self.processed_pushes
+        if device_iden in watermarks:
+            last_processed = watermarks[device_iden]
             if push_modified <= last_processed:
                 self.logger.debug(f"Push {push_iden} already processed")
-                return
+                return False
 
         # Extract link information
         url = push.get('url')
@@ -390,19 +697,100 @@ class PushbulletLinkwardenBridge:
 
         if not url:
             self.logger.warning(f"Push {push_iden} has no URL, skipping")
-            return
+            return False
 
-        # Resolve URL redirects (particularly for search.app URLs)
+        # Resolve URL redirects (search.app and other short-link URLs)
         resolved_url = self._resolve_url(url)
 
-        title = self._extract_page_title(resolved_url) or title
+        # Fetching the page is the slowest step, so only do it when the push
+        # didn't come with a title (unless configured to always refetch)
+        if not title or self.settings.always_refetch_title:
+            title = self._extract_page_title(resolved_url) or title
 
         # Save to Linkwarden with resolved URL
         self.save_to_linkwarden(resolved_url, title, body, collection_id, device_iden)
+        return True
+
+    def _run_push(self, push: Dict[str, Any], watermarks: Dict[str, float]) -> None:
+        """Worker entry point: process a push, then release it from in-flight tracking"""
+        processed = False
+        try:
+            processed = self.process_push(push, watermarks)
+        finally:
+            self._finish_push(push, processed)
+
+    def _finish_push(self, push: Dict[str, Any], processed: bool) -> None:
+        """
+        Advance the device watermark past finished pushes, but never past a push
+        of the same device that is still queued or running, so those can't be
+        skipped later (or lost on shutdown) as "already processed".
+        """
+        device_iden = push.get('target_device_iden') or push.get('source_device_iden')
+        if not device_iden:
+            return
+
+        push_modified = push.get('modified', 0)
+        with self._state_lock:
+            in_flight = self._in_flight[device_iden]
+            in_flight.remove(push_modified)
+            finished = self._finished[device_iden]
+            if processed:
+                finished.append(push_modified)
+
+            oldest_in_flight = min(in_flight, default=None)
+            ready = [m for m in finished if oldest_in_flight is None or m < oldest_in_flight]
+            if ready:
+                # Never move the watermark backwards
+                newest = max(ready)
+                if newest > self.processed_pushes.get(device_iden, 0):
+                    self.processed_pushes[device_iden] = newest
+                    self._pushes_dirty = True
+                finished[:] = [m for m in finished if m not in ready]
+
+            if not in_flight:
+                del self._in_flight[device_iden]
+                del self._finished[device_iden]
+
+    def _is_new_link_push(self, push: Dict[str, Any]) -> bool:
+        """Cheap pre-check mirroring process_push's skip rules, without any I/O"""
+        if push.get('type') != 'link':
+            return False
 
-        # Update processed pushes
-        self.processed_pushes[device_iden] = push_modified
-        self.save_processed_pushes()
+        device_iden = push.get('target_device_iden') or push.get('source_device_iden')
+        if not self.get_collection_for_device(device_iden):
+            return False
+
+        last_processed = self.processed_pushes.get(device_iden)
+        return last_processed is None or push.get('modified', 0) > last_processed
+
+    def _pushes_watermark(self) -> float:
+        """Oldest last-processed timestamp across tracked devices"""
+        return min(
+            (self.processed_pushes[iden] for iden in self._iden_to_channel
+             if iden in self.processed_pushes),
+            default=0
+        )
+
+    def process_pushes(self, pushes: List[Dict[str, Any]]) -> None:
+        """Process a batch of pushes concurrently and wait for all of them"""
+        with self._state_lock:
+            # Judge "already processed" against the watermarks from before the
+            # batch; workers move the live ones forward as they finish
+            watermarks = dict(self.processed_pushes)
+            for push in pushes:
+                device_iden = push.get('target_device_iden') or push.get('source_device_iden')
+                if device_iden:
+                    self._in_flight[device_iden].append(push.get('modified', 0))
+
+        futures = [self._executor.submit(self._run_push, push, watermarks) for push in pushes]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"Error processing push: {e}", exc_info=True)
+
+        # Persist once per batch rather than once per push
+        self._flush_processed_pushes()
 
     def save_to_linkwarden(self, url: str, title: str, description: str,
                           collection_id: int, device_iden: str) -> None:
@@ -426,7 +814,7 @@ class PushbulletLinkwardenBridge:
             'collection': {'id': collection_id}
         }
 
-        response = self._make_linkwarden_request('POST', 'links', json=link_data)
+        response = self._make_linkwarden_request('POST', 'links', data=json_dumps(link_data))
 
         if response:
             self.logger.info(f"Successfully saved link: {title or url}")
@@ -435,36 +823,54 @@ class PushbulletLinkwardenBridge:
 
     def _get_device_name(self, device_iden: str) -> str:
         """Get device name from iden"""
-        for channel in self.config['channels']:
-            if channel.get('device_iden') == device_iden:
-                return channel.get('name', device_iden)
-        return device_iden
+        channel = self._iden_to_channel.get(device_iden)
+        if channel is None:
+            return device_iden
+        return channel.get('name', device_iden)
 
     def _get_collection_name(self, collection_id: int) -> str:
         """Get collection name from ID"""
-        for channel in self.config['channels']:
-            if channel.get('collection_id') == collection_id:
-                return channel.get('collection', str(collection_id))
-        return str(collection_id)
+        return self._collection_to_name.get(collection_id, str(collection_id))
 
     def _extract_page_title(self, url: str) -> Optional[str]:
-        """Extract page title from URL using beautifulsoup4"""
+        """Extract page title from URL using lxml"""
+        cached = self._title_cache.get(url)
+        if cached is not None:
+            self.logger.debug(f"Using cached title for {url}: {cached}")
+            return cached
+
         try:
-            headers = {'User-Agent': FIREFOX_USER_AGENT}
-            response = requests.get(
+            # Stream the body and stop as soon as the title has been seen
+            buf = bytearray()
+            with self._scrape_session.get(
                 url,
-                headers=headers,
                 timeout=self.settings.request_timeout,
-                allow_redirects=True
-            )
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-            title_tag = soup.find('title')
-
-            if title_tag and title_tag.string:
-                title = title_tag.string.strip()
+                allow_redirects=True,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                content_type = response.headers.get('content-type', '')
+                for chunk in response.iter_content(chunk_size=8192):
+                    buf += chunk
+                    # Only rescan the tail; the closing tag may straddle chunks
+                    if b'</title>' in bytes(buf[-(len(chunk) + 8):]).lower():
+                        break
+                    if len(buf) >= TITLE_SCAN_LIMIT:
+                        break
+
+            if not buf:
+                return None
+
+            content = bytes(buf)
+            # Raw bytes without a declared charset would be decoded as Latin-1
+            parser = lxml.html.HTMLParser(encoding=detect_html_charset(content_type, content))
+            document = lxml.html.fromstring(content, parser=parser)
+            title_tag = next(document.iter('title'), None)
+            title = title_tag.text_content().strip() if title_tag is not None else ''
+
+            if title:
                 self.logger.debug(f"Extracted title from {url}: {title}")
+                self._title_cache.put(url, title)
                 return title
 
             return None
@@ -474,57 +880,81 @@ class PushbulletLinkwardenBridge:
 
     def _resolve_url(self, url: str) -> str:
         """
-        Resolve URL redirects, particularly for search.app URLs.
+        Resolve URL redirects for short-link hosts such as search.app.
         """
-        if not url.startswith('https://search.app/'):
-            # Not a search.app URL, return as-is
+        if not url.startswith(REDIRECT_URL_PREFIXES):
+            # Not a short-link URL, return as-is
             return url
 
-        self.logger.info(f"Resolving search.app URL: {url}")
+        cached = self._resolved_url_cache.get(url)
+        if cached is not None:
+            self.logger.debug(f"Using cached resolution {url} -> {cached}")
+            return cached
+
+        self.logger.info(f"Resolving short URL: {url}")
 
         try:
-            headers = {'User-Agent': FIREFOX_USER_AGENT}
+            resolved_url = url
+            for _ in range(MAX_REDIRECT_HOPS):
+                # A single streamed GET: read status and Location, never the body
+                with self._scrape_session.get(
+                    resolved_url,
+                    timeout=self.settings.request_timeout,
+                    allow_redirects=False,
+                    stream=True
+                ) as response:
+                    status_code = response.status_code
+                    location = response.headers.get('location')
 
-            # Try HEAD request first to get the redirect location
-            response = requests.head(
-                url,
-                headers=headers,
-                timeout=self.settings.request_timeout,
-                allow_redirects=False
-            )
+                if status_code not in (301, 302, 303, 307, 308) or not location:
+                    break
 
-            # If HEAD fails with 403, try GET instead (some services block HEAD)
-            if response.status_code == 403:
-                self.logger.debug("HEAD request returned 403, trying GET instead")
-                response = requests.get(
-                    url,
-                    headers=headers,
-                    timeout=self.settings.request_timeout,
-                    allow_redirects=False
-                )
+                resolved_url = urljoin(resolved_url, location)
+                # Keep following only while we're still on a short-link host
+                if not resolved_url.startswith(REDIRECT_URL_PREFIXES):
+                    break
 
-            if response.status_code in (301, 302, 303, 307, 308):
-                resolved_url = response.headers.get('location')
-                if resolved_url:
-                    self.logger.info(f"Resolved {url} -> {resolved_url}")
-                    return resolved_url
+            if resolved_url != url:
+                self.logger.info(f"Resolved {url} -> {resolved_url}")
+                self._resolved_url_cache.put(url, resolved_url)
+                return resolved_url
 
             # If no redirect found, return original URL
-            self.logger.warning(f"No redirect found for {url} (status: {response.status_code})")
+            self.logger.warning(f"No redirect found for {url} (status: {status_code})")
             return url
 
         except Exception as e:
             self.logger.error(f"Failed to resolve URL {url}: {e}")
             return url
 
+    def _group_pushes_by_device(self, pushes: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Bucket pushes by the tracked device(s) they target or come from"""
+        by_device: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for push in pushes:
+            for device_iden in {push.get('target_device_iden'), push.get('source_device_iden')}:
+                if device_iden in self._iden_to_channel:
+                    by_device[device_iden].append(push)
+        return by_device
+
     def process_initial_pushes(self) -> None:
         """Process pushes since last run for tracked devices"""
         self.logger.info("Processing pushes since last run")
 
-        for channel in self.config['channels']:
-            device_iden = channel.get('device_iden')
-            if not device_iden:
-                continue
+        channels = [c for c in self.config['channels'] if c.get('device_iden')]
+
+        # One fetch covers every channel: start from the oldest watermark
+        # (new devices count as 0) and bucket the result by device
+        earliest = min(
+            (self.processed_pushes.get(c['device_iden'], 0) for c in channels),
+            default=0
+        )
+        pushes = self.fetch_recent_pushes(modified_after=earliest)
+        by_device = self._group_pushes_by_device(pushes)
+
+        backlog: Dict[Any, Dict[str, Any]] = {}  # push iden -> push, deduped across devices
+        for channel in channels:
+            device_iden = channel['device_iden']
+            device_pushes = by_device.get(device_iden, [])
 
             # Check if this is a newly added device (not in processed history)
             if device_iden not in self.processed_pushes:
@@ -533,10 +963,7 @@ class PushbulletLinkwardenBridge:
                     f"Device '{channel.get('name')}' is new, "
                     "recording current state without processing old pushes"
                 )
-                pushes = self.fetch_recent_pushes(modified_after=0)
-                link_pushes = [p for p in pushes if p.get('type') == 'link'
-                              and (p.get('target_device_iden') == device_iden
-                                   or p.get('source_device_iden') == device_iden)]
+                link_pushes = [p for p in device_pushes if p.get('type') == 'link']
 
                 if link_pushes:
                     # Record the most recent push timestamp
@@ -550,42 +977,39 @@ class PushbulletLinkwardenBridge:
                     # No pushes, set to current time
                     self.processed_pushes[device_iden] = time.time()
 
-                self.save_processed_pushes()
+                self._pushes_dirty = True
                 continue
 
             # For existing devices, process new pushes since last run
             last_modified = self.processed_pushes[device_iden]
-            pushes = self.fetch_recent_pushes(modified_after=last_modified)
-
-            # Filter for this device
-            device_pushes = [
-                p for p in pushes
-                if (p.get('target_device_iden') == device_iden
-                    or p.get('source_device_iden') == device_iden)
-            ]
+            new_pushes = [p for p in device_pushes if p.get('modified', 0) > last_modified]
 
-            if device_pushes:
+            if new_pushes:
                 self.logger.info(
-                    f"Processing {len(device_pushes)} new pushes for "
+                    f"Processing {len(new_pushes)} new pushes for "
                     f"device '{channel.get('name')}'"
                 )
-                for push in device_pushes:
-                    self.process_push(push)
+                for push in new_pushes:
+                    backlog.setdefault(push.get('iden') or id(push), push)
+
+        # Also persists the watermarks recorded for new devices
+        self.process_pushes(list(backlog.values()))
 
     def on_websocket_message(self, ws: websocket.WebSocketApp, message: str) -> None:
         """Handle incoming WebSocket messages"""
         try:
-            data = json.loads(message)
+            data = json_loads(message)
             msg_type = data.get('type')
 
             self.logger.debug(f"WebSocket message: {msg_type}")
 
             if msg_type == 'tickle' and data.get('subtype') == 'push':
                 self.logger.info("Received push tickle, fetching recent pushes")
-                pushes = self.fetch_recent_pushes(modified_after=0)
+                pushes = self.fetch_recent_pushes(modified_after=self._pushes_watermark())
 
-                for push in pushes:
-                    self.process_push(push)
+                candidates = [p for p in pushes if self._is_new_link_push(p)]
+                self.logger.debug(f"{len(candidates)} of {len(pushes)} pushes need processing")
+                self.process_pushes(candidates)
 
         except json.JSONDecodeError:
             self.logger.error(f"Invalid JSON received: {message}")
@@ -608,11 +1032,23 @@ class PushbulletLinkwardenBridge:
         self.logger.info("WebSocket connection established")
         # Reset reconnect delay on successful connection
         self.reconnect_delay = self.settings.reconnect_initial_delay
+        self._reconnect_attempt = 0
+
+    def _advance_reconnect_delay(self) -> None:
+        """Exponential backoff with jitter, so several bridges don't reconnect in lockstep"""
+        self._reconnect_attempt += 1
+        # Cap the exponent so a long outage can't grow the int without bound,
+        # and clamp before jittering downwards so bridges stay de-synced at
+        # the cap while reconnect_max_delay remains a true maximum
+        delay = min(
+            self.settings.reconnect_initial_delay * 2 ** min(self._reconnect_attempt, MAX_BACKOFF_EXPONENT),
+            self.settings.reconnect_max_delay
+        )
+        self.reconnect_delay = delay * random.uniform(0.5, 1.0)
 
     def connect_to_pushbullet_stream(self) -> None:
         """Connect to Pushbullet WebSocket stream"""
-        token = self.config['pushbullet']['api_token']
-        ws_url = PUSHBULLET_WS_URL.format(token=token)
+        ws_url = PUSHBULLET_WS_URL.format(token=self._pb_token)
 
         self.logger.info("Connecting to Pushbullet stream")
 
@@ -637,9 +1073,11 @@ class PushbulletLinkwardenBridge:
             self.logger.error("Configuration validation failed")
             sys.exit(1)
 
-        # Resolve devices and collections
+        # Resolve devices and collections, then write any new IDs in one go
         self.resolve_devices()
         self.resolve_collections()
+        if self._config_dirty:
+            self.save_config()
 
         # Load processed push history
         self.load_processed_pushes()
@@ -655,15 +1093,11 @@ class PushbulletLinkwardenBridge:
                 # If we get here, the WebSocket closed normally
                 if self.running:
                     self.logger.info(
-                        f"Reconnecting in {self.reconnect_delay} seconds..."
-                    )
-                    time.sleep(self.reconnect_delay)
-
-                    # Exponential backoff
-                    self.reconnect_delay = min(
-                        self.reconnect_delay * 2,
-                        self.settings.reconnect_max_delay
+                        f"Reconnecting in {self.reconnect_delay:.1f} seconds..."
                     )
+                    if self._stop_event.wait(self.reconnect_delay):
+                        break
+                    self._advance_reconnect_delay()
 
             except KeyboardInterrupt:
                 self.logger.info("Received keyboard interrupt")
@@ -672,15 +1106,11 @@ class PushbulletLinkwardenBridge:
                 self.logger.error(f"Unexpected error: {e}", exc_info=True)
                 if self.running:
                     self.logger.info(
-                        f"Reconnecting in {self.reconnect_delay} seconds..."
-                    )
-                    time.sleep(self.reconnect_delay)
-
-                    # Exponential backoff
-                    self.reconnect_delay = min(
-                        self.reconnect_delay * 2,
-                        self.settings.reconnect_max_delay
+                        f"Reconnecting in {self.reconnect_delay:.1f} seconds..."
                     )
+                    if self._stop_event.wait(self.reconnect_delay):
+                        break
+                    self._advance_reconnect_delay()
 
         self.logger.info("Bridge stopped")
 